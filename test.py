@@ -1,15 +1,24 @@
+import atexit
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 import re
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from typing import Set, Optional, Dict, List, Union
+from typing import Set, Optional, Dict, List, Tuple, Union
 
 # 加载器关键词
 _LOADER_KEYWORDS: Set[str] = {"forge", "fabric", "neoforge", "quilt", "rift"}
 _SUFFIX_TO_STRIP: Set[str] = {"forge", "fabric", "neoforge", "quilt", "rift"}
+# 按长度降序排列，保证"neoforge"先于"forge"匹配
+_SUFFIX_TUPLE: Tuple[str, ...] = tuple(sorted(_SUFFIX_TO_STRIP, key=len, reverse=True))
 
 # 状态码映射
 _STATUS_MAP = {"需装": 1, "可选": 2, "无效": 3}
@@ -24,77 +33,141 @@ _SERVER_MAPPING = {
     3: "ServerInvalid"
 }
 
+# 预编译正则表达式
+# 运行环境状态：第1组为客户端，第2组为完整格式中的服务端，第3组为单独出现的服务端
+_RE_ENV = re.compile(
+    r'运行环境:\s*(?:客户端(需装|可选|无效)(?:\s*,\s*服务端(需装|可选|无效))?'
+    r'|服务端(需装|可选|无效))'
+)
+_RE_URL = re.compile(r'www\.mcmod\.cn/class/\d+\.html')
+_RE_BRACKET_PREFIX = re.compile(r"^\[[^\]]+\]\s*")
+_RE_SPECIAL_CHARS = re.compile(r"[()\[\]{}@~`'\"&^%$#*=<>|\\/]")
+_RE_SPLIT = re.compile(r"[\s_\-\+]+")
+# 特殊字符与分隔符统一替换为空格（与_RE_SPECIAL_CHARS、_RE_SPLIT等价的快速路径）
+_SEPARATOR_TABLE = str.maketrans({c: " " for c in "()[]{}@~`'\"&^%$#*=<>|\\/_-+"})
+_RE_NON_ALNUM = re.compile(r"[^A-Za-z0-9\s]")
+_RE_ALPHA = re.compile(r"[A-Za-z]")
+# 版本标识符（如pre, rc, beta等）
+_RE_VERSION_INDICATOR = re.compile(r"pre|rc|beta|alpha|dev")
+_DIGITS = frozenset("0123456789")
+
+
+def _has_digit(text: str) -> bool:
+    """判断字符串是否包含数字（ASCII走集合快速路径，其余保留str.isdigit语义，如"²"）"""
+    if text.isascii():
+        return not _DIGITS.isdisjoint(text)
+    return any(char.isdigit() for char in text)
+
+
+# 改进的版本号检测模式（包含Minecraft版本号识别），合并为单个正则
+_RE_VERSION = re.compile("|".join(f"(?:{pattern})" for pattern in [
+    r'^v?\d+\.\d+(?:\.\d+){0,2}[a-z]*$',  # v1.2.3a, 1.2.3-beta
+    r'^mc?1?\d\.\d{1,2}(?:\.\d+)?[a-z]*$',  # mc1.20.1, 1.20.1a
+    r'^\d+(?:\.\d+)*[a-z]*$',  # 1.2.3a, 2023.1
+    r'^\d+[a-z]+\d*$',  # 5a, 2b3
+    r'^[a-z]+\d+[a-z]*$',  # alpha2, beta3
+    r'^\d+$'  # 纯数字
+]))
+
+# 共享的requests会话（复用连接池，避免每次请求重新握手）
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'})
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# 限制同时访问服务器的请求数
+_REQUEST_SEMAPHORE = threading.Semaphore(4)
+
+# 环境状态缓存（基础名称 -> (客户端状态, 服务端状态)）
+_ENV_CACHE: Dict[str, Tuple[int, int]] = {}
+_ENV_CACHE_LOCK = threading.Lock()
+
+# Selenium驱动（按线程复用，退出时统一关闭）
+_SELENIUM_LOCAL = threading.local()
+_SELENIUM_DRIVERS: List[webdriver.Chrome] = []
+_SELENIUM_DRIVERS_LOCK = threading.Lock()
+
+# 日志输出（线程池任务中按JAR缓存，处理完后整块输出，避免多线程日志交错）
+_LOG_LOCAL = threading.local()
+_PRINT_LOCK = threading.Lock()
+
+
+def _log(message: str) -> None:
+    """输出日志：当前线程正在缓存时先存入缓冲区，否则直接加锁输出"""
+    buffer = getattr(_LOG_LOCAL, 'buffer', None)
+    if buffer is not None:
+        buffer.append(message)
+        return
+    with _PRINT_LOCK:
+        print(message)
+
 
-def check_environment_status(file_path: Path) -> Optional[List[int]]:
-    """检查环境状态文件并返回状态码列表（支持单状态）"""
+def check_environment_status(file_path: Path, content: Optional[str] = None) -> Optional[List[int]]:
+    """检查环境状态文件并返回状态码列表（支持单状态），已读取的内容可通过content传入"""
     try:
-        content = read_file_with_fallback(file_path)  # 假设已实现该函数
+        if content is None:
+            content = read_file_with_fallback(file_path)
         if not content:
             return None
 
-        # 尝试匹配完整格式：运行环境: 客户端X, 服务端Y
-        full_match = re.search(
-            r'运行环境:\s*客户端(需装|可选|无效)\s*,\s*服务端(需装|可选|无效)',
-            content
-        )
-        if full_match:
-            return [
-                _STATUS_MAP[full_match.group(1)],
-                _STATUS_MAP[full_match.group(2)]
-            ]
-
-        # 尝试匹配客户端单状态
-        client_match = re.search(
-            r'运行环境:\s*客户端(需装|可选|无效)',
-            content
-        )
-        # 尝试匹配服务端单状态
-        server_match = re.search(
-            r'运行环境:\s*服务端(需装|可选|无效)',
-            content
-        )
-
-        # 处理不同组合情况
-        if client_match and server_match:
-            # 同时存在两个单状态（取第一个匹配项）
-            return [
-                _STATUS_MAP[client_match.group(1)],
-                _STATUS_MAP[server_match.group(1)]
-            ]
-        elif client_match:
-            # 仅客户端状态
-            return [_STATUS_MAP[client_match.group(1)], 3]
-        elif server_match:
-            # 仅服务端状态
-            return [3, _STATUS_MAP[server_match.group(1)]]
-        else:
+        # 单次扫描全文：完整格式（运行环境: 客户端X, 服务端Y）优先，
+        # 否则组合首个客户端单状态与首个服务端单状态
+        client_status = server_status = None
+        for match in _RE_ENV.finditer(content):
+            if match.group(2):
+                return [_STATUS_MAP[match.group(1)], _STATUS_MAP[match.group(2)]]
+            if match.group(1) and client_status is None:
+                client_status = match.group(1)
+            if match.group(3) and server_status is None:
+                server_status = match.group(3)
+
+        if client_status is None and server_status is None:
             return None  # 无有效状态
 
+        # 缺省的一方视为无效
+        return [
+            _STATUS_MAP[client_status] if client_status else 3,
+            _STATUS_MAP[server_status] if server_status else 3
+        ]
+
     except Exception as e:
-        print(f"处理文件时出错: {e}")
+        _log(f"处理文件时出错: {e}")
         return None
 
 
-def read_file_with_fallback(file_path: Path) -> Optional[str]:
-    """尝试用不同编码读取文件内容"""
-    encodings = ['utf-8', 'gbk']
+def _decode_with_fallback(data: bytes) -> str:
+    """尝试用不同编码解码网页内容（mcmod.cn页面为UTF-8，优先尝试）"""
+    encodings = ['utf-8-sig', 'gbk']  # utf-8-sig兼容带BOM的UTF-8文件
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read()
+            return data.decode(encoding)
         except UnicodeDecodeError:
             continue
-        except Exception as e:
-            print(f"读取文件 {file_path} 时出错: {e}")
-            return None
-    return None
+    # 均失败时（如页面含个别损坏字节）按UTF-8容错解码，保证其余内容仍可解析
+    return data.decode('utf-8', errors='replace')
+
+
+def read_file_with_fallback(file_path: Path) -> Optional[str]:
+    """尝试用不同编码读取文件内容"""
+    try:
+        data = file_path.read_bytes()
+    except Exception as e:
+        _log(f"读取文件 {file_path} 时出错: {e}")
+        return None
+    return _decode_with_fallback(data)
 
 
 def find_target_urls_in_folder(folder_path: Path) -> Dict[str, Optional[str]]:
     """在文件夹中查找所有TXT文件中的目标URL"""
     results = {}
     if not folder_path.is_dir():
-        print(f"错误: '{folder_path}' 不是有效目录")
+        _log(f"错误: '{folder_path}' 不是有效目录")
         return results
 
     for file_path in folder_path.glob('*.txt'):
@@ -103,22 +176,20 @@ def find_target_urls_in_folder(folder_path: Path) -> Dict[str, Optional[str]]:
             results[file_path.name] = None
             continue
 
-        match = re.search(r'www\.mcmod\.cn/class/\d+\.html', content)
+        match = _RE_URL.search(content)
         results[file_path.name] = f"http://{match.group(0)}" if match else None
 
     return results
 
 
-def find_target_url_in_file(file_path: Path) -> Optional[str]:
-    """在单个文件中查找目标URL"""
-    if not file_path.is_file() or file_path.suffix.lower() != '.txt':
-        return None
-
-    content = read_file_with_fallback(file_path)
+def find_target_url_in_file(file_path: Path, content: Optional[str] = None) -> Optional[str]:
+    """在单个文件中查找目标URL，已读取的内容可通过content传入"""
+    if content is None:
+        content = read_file_with_fallback(file_path)
     if not content:
         return None
 
-    match = re.search(r'www\.mcmod\.cn/class/\d+\.html', content)
+    match = _RE_URL.search(content)
     return f"http://{match.group(0)}" if match else None
 
 
@@ -129,47 +200,82 @@ def save_webpage(url: str, file_path: Path, use_selenium: bool = False) -> bool:
             return _save_with_selenium(url, file_path)
         return _save_with_requests(url, file_path)
     except Exception as e:
-        print(f"保存网页出错: {e}")
+        _log(f"保存网页出错: {e}")
         return False
 
 
 def _save_with_requests(url: str, file_path: Path) -> bool:
     """使用requests保存网页"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+    return _download_page(url, file_path) is not None
+
+
+def _download_page(url: str, file_path: Path) -> Optional[bytes]:
+    """使用共享会话下载网页并保存原始字节，返回网页内容，失败时返回None"""
+    try:
+        with _REQUEST_SEMAPHORE:
+            response = _SESSION.get(url, timeout=15)
+        response.raise_for_status()
+
+        # 直接写入原始字节，编码在解析时处理
+        with open(file_path, 'wb') as f:
+            f.write(response.content)
+        return response.content
+    except Exception as e:
+        _log(f"Requests错误: {e}")
+        return None
+
+
+def _get_selenium_driver():
+    """获取当前线程复用的Selenium驱动（驱动非线程安全，每个线程单独创建一个）"""
+    driver = getattr(_SELENIUM_LOCAL, 'driver', None)
+    if driver is None:
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+
+        driver = webdriver.Chrome(options=options)
+        driver.set_page_load_timeout(10)
+        _SELENIUM_LOCAL.driver = driver
+        with _SELENIUM_DRIVERS_LOCK:
+            _SELENIUM_DRIVERS.append(driver)
+    return driver
+
 
+def _discard_selenium_driver() -> None:
+    """关闭并丢弃当前线程的驱动，下次调用时重新创建"""
+    driver = getattr(_SELENIUM_LOCAL, 'driver', None)
+    if driver is None:
+        return
+    _SELENIUM_LOCAL.driver = None
+    with _SELENIUM_DRIVERS_LOCK:
+        if driver in _SELENIUM_DRIVERS:
+            _SELENIUM_DRIVERS.remove(driver)
     try:
-        session = requests.Session()
-        session.headers.update(headers)
+        driver.quit()
+    except Exception:
+        pass
 
-        # 两次请求模拟真实访问
-        session.get(url, timeout=10)
-        time.sleep(1)
 
-        response = session.get(url, timeout=15)
-        response.raise_for_status()
+def _quit_selenium_drivers() -> None:
+    """程序退出时关闭所有Selenium驱动"""
+    with _SELENIUM_DRIVERS_LOCK:
+        drivers = list(_SELENIUM_DRIVERS)
+        _SELENIUM_DRIVERS.clear()
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception:
+            pass
 
-        # 处理编码
-        content = response.content.decode(response.apparent_encoding or 'utf-8', errors='ignore')
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    except Exception as e:
-        print(f"Requests错误: {e}")
-        return False
+atexit.register(_quit_selenium_drivers)
 
 
 def _save_with_selenium(url: str, file_path: Path) -> bool:
-    """使用Selenium保存动态网页"""
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-
-    driver = webdriver.Chrome(options=options)
+    """使用Selenium保存动态网页（复用当前线程的浏览器实例）"""
     try:
-        driver.set_page_load_timeout(10)
+        driver = _get_selenium_driver()
         driver.get(url)
         time.sleep(2)  # 等待JS执行
 
@@ -177,10 +283,10 @@ def _save_with_selenium(url: str, file_path: Path) -> bool:
             f.write(driver.page_source)
         return True
     except Exception as e:
-        print(f"Selenium错误: {e}")
+        _log(f"Selenium错误: {e}")
+        # 驱动可能已失效，丢弃后下次重新创建
+        _discard_selenium_driver()
         return False
-    finally:
-        driver.quit()
 
 
 def extract_jar_basename(filename: str) -> Optional[str]:
@@ -195,24 +301,32 @@ def extract_jar_basename(filename: str) -> Optional[str]:
     返回:
         str: 提取的基础名称，失败时返回None
     """
-    # 检查是否为JAR文件
+    # 检查是否为JAR文件（在缓存之外检查，非字符串等不可哈希参数也能返回None）
     if not isinstance(filename, str) or not filename.lower().endswith(".jar"):
         return None
 
-    # 仅保留文件名（不含路径）并移除扩展名
-    fname = Path(filename).name
-    if fname.lower().endswith(".jar"):
-        fname = fname[:-4]  # 移除.jar扩展名
+    return _extract_jar_basename(filename)
+
 
-    # 去除 [...] 前缀（如 [JEI物品管理器]）
-    fname = re.sub(r"^\[[^\]]+\]\s*", "", fname)
+@lru_cache(maxsize=4096)
+def _extract_jar_basename(filename: str) -> Optional[str]:
+    """extract_jar_basename的缓存实现，filename须为以.jar结尾的字符串"""
+    # 仅保留文件名（不含路径）并移除扩展名（上方已确认以.jar结尾）
+    fname = Path(filename).name[:-4]  # 移除.jar扩展名
 
-    # 替换特殊字符为空格（括号、标点等）
-    fname = re.sub(r"[()\[\]{}@~`'\"&^%$#*=<>|\\/]", " ", fname)
+    if not fname.startswith("[") and fname.isascii():
+        # 快速路径：无前缀的ASCII文件名，直接将特殊字符和分隔符替换为空格后分割
+        parts = fname.translate(_SEPARATOR_TABLE).split()
+    else:
+        # 去除 [...] 前缀（如 [JEI物品管理器]）
+        fname = _RE_BRACKET_PREFIX.sub("", fname)
 
-    # 分割文件名（使用多种分隔符）
-    parts = re.split(r"[\s_\-\+]+", fname)
-    parts = [p.strip() for p in parts if p.strip()]
+        # 替换特殊字符为空格（括号、标点等）
+        fname = _RE_SPECIAL_CHARS.sub(" ", fname)
+
+        # 分割文件名（使用多种分隔符）
+        parts = _RE_SPLIT.split(fname)
+        parts = [p.strip() for p in parts if p.strip()]
 
     if not parts:
         return None
@@ -223,36 +337,21 @@ def extract_jar_basename(filename: str) -> Optional[str]:
         lower_part = part.lower()
 
         # 检查是否是加载器关键词（精确匹配）
-        if any(kw == lower_part for kw in _LOADER_KEYWORDS) and i > 0:
+        if lower_part in _LOADER_KEYWORDS and i > 0:
             # 如果是加载器且在第二个位置之后，停止添加
             break
 
-        # 改进的版本号检测模式（包含Minecraft版本号识别）
-        version_patterns = [
-            r'^v?\d+\.\d+(\.\d+){0,2}[a-z]*$',  # v1.2.3a, 1.2.3-beta
-            r'^mc?1?\d\.\d{1,2}(\.\d+)?[a-z]*$',  # mc1.20.1, 1.20.1a
-            r'^\d+(\.\d+)*[a-z]*$',  # 1.2.3a, 2023.1
-            r'^\d+[a-z]+\d*$',  # 5a, 2b3
-            r'^[a-z]+\d+[a-z]*$',  # alpha2, beta3
-            r'^\d+$'  # 纯数字
-        ]
-
-        is_version = False
-        for pattern in version_patterns:
-            if re.match(pattern, lower_part):
-                is_version = True
-                break
+        is_version = _RE_VERSION.match(lower_part) is not None
 
         # 如果检测到版本号且已有合并内容，则停止
         if is_version and merged:
             break
 
         # 检查是否包含版本标识符（如pre, rc, beta等）
-        version_indicators = ['pre', 'rc', 'beta', 'alpha', 'dev']
-        has_version_indicator = any(indicator in lower_part for indicator in version_indicators)
+        has_version_indicator = _RE_VERSION_INDICATOR.search(lower_part) is not None
 
         # 如果包含版本标识符且已有合并内容，并且有数字，则停止
-        if has_version_indicator and merged and any(char.isdigit() for char in lower_part):
+        if has_version_indicator and merged and _has_digit(lower_part):
             break
 
         # 检查是否是纯数字片段（即使没匹配版本模式）
@@ -278,6 +377,7 @@ def extract_jar_basename(filename: str) -> Optional[str]:
         if prefix.endswith('s'):
             prefix = prefix[:-1].rstrip()
         candidate = f"{prefix} API"
+        lower_candidate = candidate.lower()
     elif lower_candidate.endswith("lib"):
         # 分离LIB后缀
         prefix = candidate[:-3].rstrip()
@@ -285,27 +385,25 @@ def extract_jar_basename(filename: str) -> Optional[str]:
         if prefix.endswith('s'):
             prefix = prefix[:-1].rstrip()
         candidate = f"{prefix} Lib"
+        lower_candidate = candidate.lower()
 
     # 去除尾部后缀（forge/fabric/neoforge）
-    lower_candidate = candidate.lower()
-    for suffix in _SUFFIX_TO_STRIP:
-        if lower_candidate.endswith(suffix):
-            idx = len(candidate) - len(suffix)
-            candidate = candidate[:idx].strip()
-            break
+    if lower_candidate.endswith(_SUFFIX_TUPLE):
+        for suffix in _SUFFIX_TUPLE:
+            if lower_candidate.endswith(suffix):
+                idx = len(candidate) - len(suffix)
+                candidate = candidate[:idx].strip()
+                break
 
     # 清理非法字符（保留字母、数字和空格）
-    candidate = re.sub(r"[^A-Za-z0-9\s]", "", candidate)
+    candidate = _RE_NON_ALNUM.sub("", candidate)
 
     # 处理特殊情况：移除孤立的数字（如 "naturalist 50pre3" -> "naturalist"）
     words = candidate.split()
     cleaned_words = []
     for word in words:
-        # 保留纯字母单词
-        if word.isalpha():
-            cleaned_words.append(word)
-        # 保留包含字母和数字的单词（如 "forgecraft2"）
-        elif any(char.isalpha() for char in word) and any(char.isdigit() for char in word):
+        # 清理后单词仅含字母和数字：保留纯字母单词及字母数字混合单词（如 "forgecraft2"）
+        if _RE_ALPHA.search(word):
             cleaned_words.append(word)
         # 跳过纯数字单词（如版本号）
 
@@ -318,57 +416,79 @@ def extract_jar_basename(filename: str) -> Optional[str]:
     return candidate if candidate else None
 
 
-def process_jar_file(jar_path: Path, output_dir: Path) -> None:
-    """处理单个JAR文件"""
-    print(f"处理文件: {jar_path.name}")
-
-    # 提取基础名称
-    base_name = extract_jar_basename(jar_path.name)
-    if not base_name:
-        print("无法提取有效名称")
-        # 确保目标目录存在
-        (output_dir / "unknown").mkdir(parents=True, exist_ok=True)
-        shutil.copy2(jar_path, output_dir / "unknown" / jar_path.name)
-        return
+def _place(src: Path, dst: Path) -> None:
+    """将文件放置到目标位置：优先创建硬链接，不支持时（如跨设备）回退为复制"""
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            return  # 上次运行已链接
+        dst.unlink()  # 覆盖旧文件
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
-    print(f"提取名称: {base_name}")
 
-    # 创建必要目录
-    web_dir = output_dir / "webTxt"
-    web_dir.mkdir(exist_ok=True)
-    search_path = web_dir / f"{base_name}.txt"
+def _fetch_environment_status(base_name: str, output_dir: Path) -> Optional[Tuple[int, int]]:
+    """在mcmod.cn搜索并解析模组的运行环境，失败时返回None"""
+    # webTxt目录由organize_mods预先创建
+    search_path = output_dir / "webTxt" / f"{base_name}.txt"
 
-    # 获取搜索结果
+    # 获取搜索结果（直接下载，网页内容在内存中解析，无需回读文件）
     search_url = f"https://search.mcmod.cn/s?key={base_name}"
-    if not save_webpage(search_url, search_path, use_selenium=False):
-        print("搜索失败")
-        (output_dir / "unknown").mkdir(parents=True, exist_ok=True)
-        shutil.copy2(jar_path, output_dir / "unknown" / jar_path.name)
-        return
+    data = _download_page(search_url, search_path)
+    if data is None:
+        _log("搜索失败")
+        return None
 
     # 获取目标URL
-    target_url = find_target_url_in_file(search_path)
+    content = _decode_with_fallback(data)
+    target_url = find_target_url_in_file(search_path, content) if content else None
     if not target_url:
-        print("未找到目标URL")
-        (output_dir / "unknown").mkdir(parents=True, exist_ok=True)
-        shutil.copy2(jar_path, output_dir / "unknown" / jar_path.name)
-        return
+        _log("未找到目标URL")
+        return None
 
     # 获取详情页
-    if not save_webpage(target_url, search_path):
-        print("详情页获取失败")
-        (output_dir / "unknown").mkdir(parents=True, exist_ok=True)
-        shutil.copy2(jar_path, output_dir / "unknown" / jar_path.name)
-        return
+    data = _download_page(target_url, search_path)
+    if data is None:
+        _log("详情页获取失败")
+        return None
 
     # 检查环境状态
-    statuses = check_environment_status(search_path)
+    content = _decode_with_fallback(data)
+    statuses = check_environment_status(search_path, content) if content else None
     if not statuses or len(statuses) < 2:
-        print("环境状态解析失败")
-        (output_dir / "unknown").mkdir(parents=True, exist_ok=True)
-        shutil.copy2(jar_path, output_dir / "unknown" / jar_path.name)
+        _log("环境状态解析失败")
+        return None
+
+    return statuses[0], statuses[1]
+
+
+def process_jar_file(jar_path: Path, output_dir: Path) -> None:
+    """处理单个JAR文件（输出目录结构需已由organize_mods创建）"""
+    _log(f"处理文件: {jar_path.name}")
+
+    # 提取基础名称
+    base_name = extract_jar_basename(jar_path.name)
+    if not base_name:
+        _log("无法提取有效名称")
+        _place(jar_path, output_dir / "unknown" / jar_path.name)
         return
 
+    _log(f"提取名称: {base_name}")
+
+    # 同名模组只联网查询一次
+    with _ENV_CACHE_LOCK:
+        statuses = _ENV_CACHE.get(base_name)
+    if statuses is not None:
+        _log("使用缓存的环境状态")
+    else:
+        statuses = _fetch_environment_status(base_name, output_dir)
+        if statuses is None:
+            _place(jar_path, output_dir / "unknown" / jar_path.name)
+            return
+        with _ENV_CACHE_LOCK:
+            _ENV_CACHE[base_name] = statuses
+
     # 处理状态码
     client_status, server_status = statuses
     client_subdir = _CLIENT_MAPPING.get(client_status, "ClientInvalid")
@@ -377,17 +497,28 @@ def process_jar_file(jar_path: Path, output_dir: Path) -> None:
     client_dir = output_dir / "classified" / client_subdir
     server_dir = output_dir / "classified" / server_subdir
 
-    # 确保目录存在
-    client_dir.mkdir(parents=True, exist_ok=True)
-    server_dir.mkdir(parents=True, exist_ok=True)
-
     # 复制文件
-    shutil.copy2(jar_path, client_dir / jar_path.name)
-    shutil.copy2(jar_path, server_dir / jar_path.name)
-    print(f"已分类: 客户端={client_subdir}, 服务端={server_subdir}")
+    _place(jar_path, client_dir / jar_path.name)
+    _place(jar_path, server_dir / jar_path.name)
+    _log(f"已分类: 客户端={client_subdir}, 服务端={server_subdir}")
+
+
+def _process_jar_group(jar_paths: List[Path], output_dir: Path) -> None:
+    """顺序处理一组同名JAR文件（在线程池中执行）"""
+    for jar_path in jar_paths:
+        _LOG_LOCAL.buffer = []
+        try:
+            process_jar_file(jar_path, output_dir)
+        finally:
+            # 将该JAR的全部日志作为一个整体输出
+            lines = _LOG_LOCAL.buffer
+            _LOG_LOCAL.buffer = None
+            lines.append('-' * 40)
+            with _PRINT_LOCK:
+                print("\n".join(lines))
 
 
-def organize_mods(input_dir: Union[str, Path], output_dir: Union[str, Path]) -> None:
+def organize_mods(input_dir: Union[str, Path], output_dir: Union[str, Path], max_workers: int = 8) -> None:
     """主处理函数：组织MOD文件"""
     # 将输入转换为Path对象
     input_dir = Path(input_dir)
@@ -404,20 +535,43 @@ def organize_mods(input_dir: Union[str, Path], output_dir: Union[str, Path]) ->
                    "ClientRequired", "ClientOptional", "ClientInvalid"]:
         (classified_dir / subdir).mkdir(exist_ok=True)
 
-    # 处理文件
-    for item in input_dir.iterdir():
-        if item.is_file() and item.suffix.lower() == '.jar':
-            process_jar_file(item, output_dir)
-        else:
-            # 非JAR文件复制到unknown
-            dest = unknown_dir / item.name
-            if item.is_dir():
-                if dest.exists():
-                    shutil.rmtree(dest)  # 如果目标已存在，先删除
-                shutil.copytree(item, dest)
+    (output_dir / "webTxt").mkdir(exist_ok=True)
+
+    # 处理文件：JAR按基础名称分组，同名JAR共用webTxt文件，需在同一线程内顺序处理
+    jar_groups: Dict[str, List[Path]] = {}
+    # os.scandir的目录项自带文件类型信息，无需逐项stat
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            item = Path(entry.path)
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() == '.jar':
+                base_name = extract_jar_basename(entry.name)
+                if base_name:
+                    jar_groups.setdefault(base_name, []).append(item)
+                else:
+                    # 无法提取名称的JAR无需联网，单独处理
+                    jar_groups[entry.path] = [item]
             else:
-                shutil.copy2(item, dest)
-        print('-' * 40)
+                # 非JAR文件复制到unknown
+                dest = unknown_dir / entry.name
+                if entry.is_dir():
+                    if dest.exists():
+                        shutil.rmtree(dest)  # 如果目标已存在，先删除
+                    shutil.copytree(item, dest)
+                else:
+                    shutil.copy2(item, dest)
+                _log('-' * 40)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_process_jar_group, jar_paths, output_dir): jar_paths
+            for jar_paths in jar_groups.values()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                names = ", ".join(p.name for p in futures[future])
+                _log(f"处理 {names} 时出错: {e}")
 
 organize_mods("mods", "output")
 print("===end===")